@@ -1,10 +1,15 @@
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import logging
-from typing import List, Optional
+import threading
+import time
+from typing import Optional
 
 import chromadb
 from chromadb.errors import NotFoundError
+from fastapi.concurrency import run_in_threadpool
 
 from common.config import Settings
 from common.embedding import EmbeddingConfig, build_embedding_function, normalise_model_name
@@ -13,13 +18,79 @@ from common.exceptions import ChromaConnectionError, EmbeddingConfigMismatchErro
 logger = logging.getLogger(__name__)
 
 
+def _configure_connection_pool(client, pool_size: int, max_retries: int) -> None:
+    """Tune keep-alive pooling on the HTTP session behind a Chroma client.
+
+    `chromadb.HttpClient` does not expose its session, so this reaches into
+    the client's server object. Older chromadb releases use a
+    `requests.Session`, newer ones an `httpx.Client`; anything else is left
+    untouched.
+    """
+
+    server = getattr(client, "_server", None)
+    session = getattr(server, "_session", None)
+    if session is None:
+        logger.debug("Chroma client exposes no HTTP session; leaving pooling as-is")
+        return
+
+    try:
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+    except ImportError:  # pragma: no cover - depends on chromadb version
+        requests = None
+
+    if requests is not None and isinstance(session, requests.Session):
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=Retry(total=max_retries, backoff_factor=0.1),
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return
+
+    try:
+        import httpx
+    except ImportError:  # pragma: no cover - depends on chromadb version
+        return
+
+    if isinstance(session, httpx.Client):
+        # httpx fixes pool limits at construction time, so swap in an
+        # equivalent client. Limits and TLS verification belong to the
+        # transport (httpx ignores the client-level ones once a transport is
+        # given); verification is not readable back from the old client, so
+        # it is taken from the same chromadb setting the client was built from.
+        verify = getattr(getattr(server, "_settings", None), "chroma_server_ssl_verify", None)
+        server._session = httpx.Client(
+            headers=session.headers,
+            cookies=session.cookies,
+            auth=session.auth,
+            timeout=session.timeout,
+            follow_redirects=session.follow_redirects,
+            event_hooks=session.event_hooks,
+            trust_env=session.trust_env,
+            transport=httpx.HTTPTransport(
+                verify=True if verify is None else verify,
+                limits=httpx.Limits(
+                    max_connections=pool_size,
+                    max_keepalive_connections=pool_size,
+                ),
+                retries=max_retries,
+                trust_env=session.trust_env,
+            ),
+        )
+        session.close()
+
+
 class RAGService:
     """Encapsulates the retrieval pipeline and embedding drift checks."""
 
     def __init__(self, settings: Settings) -> None:
         self._settings = settings
+        self._normalised_model_name = normalise_model_name(settings.embedding_model_name)
         self._embedding_config = EmbeddingConfig(
-            model_name=normalise_model_name(settings.embedding_model_name),
+            model_name=self._normalised_model_name,
             version=settings.embedding_config_version,
         )
         self._embedding_function = build_embedding_function(settings.embedding_model_name)
@@ -27,6 +98,13 @@ class RAGService:
         self._client = chromadb.HttpClient(
             host=settings.chroma_host,
             port=settings.chroma_port,
+            tenant=settings.chroma_tenant,
+            database=settings.chroma_database,
+        )
+        _configure_connection_pool(
+            self._client,
+            pool_size=settings.chroma_pool_size,
+            max_retries=settings.chroma_max_retries,
         )
 
         self._collection: Optional[chromadb.api.models.Collection.Collection] = None
@@ -34,6 +112,28 @@ class RAGService:
         self._embedding_drift_detected: bool = False
         self._chroma_connected: bool = False
 
+        # Monotonic completion time of the last successful refresh, used to
+        # serve health checks from cache; 0.0 means "never refreshed".
+        self._last_refresh_ts: float = 0.0
+        self._refresh_lock = asyncio.Lock()
+
+        # Circuit breaker for `check_chroma_health` (monotonic timestamps).
+        self._breaker_until: float = 0.0
+        self._health_backoff: float = 0.0
+        self._health_lock = threading.Lock()
+
+        # Micro-batching of concurrent queries; started from the app lifespan.
+        self._batch_queue: Optional[asyncio.Queue] = None
+        self._batch_worker: Optional[asyncio.Task] = None
+        self._batch_tasks: set[asyncio.Task] = set()
+
+    def close(self) -> None:
+        """Close pooled connections to ChromaDB (call on shutdown)."""
+
+        session = getattr(getattr(self._client, "_server", None), "_session", None)
+        if session is not None and hasattr(session, "close"):
+            session.close()
+
     # ------------------------------------------------------------------
     # State management / health
     # ------------------------------------------------------------------
@@ -112,6 +212,29 @@ class RAGService:
             logger.exception("Failed to refresh state from ChromaDB: %s", exc)
             raise ChromaConnectionError("Unable to connect to ChromaDB") from exc
 
+    async def refresh_state_cached(self, force: bool = False) -> None:
+        """Refresh state from ChromaDB unless a recent refresh is still fresh.
+
+        At most one refresh runs at a time: while one is in flight, other
+        callers return immediately and observe the last known state instead
+        of queueing identical round-trips. The cache timestamp is taken when
+        the refresh *completes*, so slow refreshes do not immediately expire.
+
+        With `force=True` the TTL is ignored and the caller waits for its own
+        refresh, even if another one is already in flight.
+        """
+
+        if not force:
+            if time.monotonic() - self._last_refresh_ts < self._settings.health_cache_ttl:
+                return
+
+            if self._refresh_lock.locked():
+                return
+
+        async with self._refresh_lock:
+            await run_in_threadpool(self.refresh_state)
+            self._last_refresh_ts = time.monotonic()
+
     @property
     def chroma_connected(self) -> bool:
         return self._chroma_connected
@@ -131,9 +254,7 @@ class RAGService:
 
         return {
             "collection_name": self._settings.chroma_collection,
-            "current_embedding_model": normalise_model_name(
-                self._settings.embedding_model_name
-            ),
+            "current_embedding_model": self._normalised_model_name,
             "current_embedding_config_id": self._embedding_config.config_id,
             "collection_embedding_config_id": self._collection_embedding_config_id,
             "drift_detected": self._embedding_drift_detected,
@@ -144,19 +265,48 @@ class RAGService:
 
         Uses the client's built-in `heartbeat` endpoint if available, or falls
         back to listing collections.
+
+        After a failure, further checks report unhealthy without any network
+        call until an exponentially growing backoff expires, so probes do not
+        pile up blocking calls while Chroma is down.
         """
 
+        now = time.monotonic()
+        if now < self._breaker_until:
+            return False
+
         try:
             # Newer versions of chromadb expose heartbeat on HttpClient
             if hasattr(self._client, "heartbeat"):
                 self._client.heartbeat()
             else:
                 self._client.list_collections()
-            return True
-        except Exception as exc:  # pragma: no cover - defensive
-            logger.exception("Chroma health check failed: %s", exc)
+        except Exception as exc:
+            # Probes run concurrently on the threadpool; only the first one to
+            # fail while the breaker is closed grows the backoff, so a single
+            # outage doubles it once rather than once per in-flight probe.
+            with self._health_lock:
+                failed_at = time.monotonic()
+                if failed_at >= self._breaker_until:
+                    if self._health_backoff:
+                        backoff = self._health_backoff * 2
+                    else:
+                        backoff = self._settings.chroma_health_backoff_initial
+                    self._health_backoff = min(backoff, self._settings.chroma_health_backoff_max)
+                    self._breaker_until = failed_at + self._health_backoff
+                backoff = self._health_backoff
+            logger.exception(
+                "Chroma health check failed; skipping checks for %.1fs: %s",
+                backoff,
+                exc,
+            )
             return False
 
+        with self._health_lock:
+            self._health_backoff = 0.0
+            self._breaker_until = 0.0
+        return True
+
     # ------------------------------------------------------------------
     # Query API
     # ------------------------------------------------------------------
@@ -167,6 +317,15 @@ class RAGService:
         by other components if desired.
         """
 
+        return self.query_batch([question], k=k)[0]
+
+    def query_batch(self, questions: list[str], k: int = 3) -> list[dict]:
+        """Run several semantic searches sharing the same `k` in one round trip.
+
+        Returns one result dict per question, in the same order as
+        `questions`, with the same shape as `query`.
+        """
+
         if not self.is_ready:
             raise EmbeddingConfigMismatchError(
                 "RAG service is not ready: either Chroma is unavailable or embedding drift was detected."
@@ -179,32 +338,166 @@ class RAGService:
                 "Query requested but collection '%s' does not exist or is empty.",
                 self._settings.chroma_collection,
             )
-            return {
-                "question": question,
-                "ids": [],
-                "distances": [],
-                "metadatas": [],
-                "documents": [],
+            return [
+                {
+                    "ids": [],
+                    "distances": [],
+                    "metadatas": [],
+                    "documents": [],
+                }
+                for _ in questions
+            ]
+
+        if logger.isEnabledFor(logging.DEBUG):
+            for question in questions:
+                logger.debug("Running semantic search for question: %s", question)
+
+        try:
+            results = self._collection.query(
+                query_texts=questions,
+                n_results=k,
+                include=["metadatas", "documents", "distances"],
+            )
+        except Exception as exc:
+            # The cached collection handle may be stale (e.g. the init service
+            # rebuilt the collection); force the next refresh to re-attach.
+            self._last_refresh_ts = 0.0
+            logger.exception("Chroma query failed: %s", exc)
+            raise ChromaConnectionError("Chroma query failed") from exc
+
+        # Chroma returns one list per query text, in request order, for ids
+        # and every field named in `include`.
+        return [
+            {
+                "ids": ids,
+                "distances": distances,
+                "metadatas": metadatas,
+                "documents": documents,
             }
+            for ids, distances, metadatas, documents in zip(
+                results["ids"],
+                results["distances"],
+                results["metadatas"],
+                results["documents"],
+            )
+        ]
 
-        logger.info("Running semantic search for question: %s", question)
+    def prewarm(self) -> None:
+        """Issue a throwaway query so Chroma loads the collection's index.
 
-        results = self._collection.query(
-            query_texts=[question],
-            n_results=k,
-            include=["metadatas", "documents", "distances"],
-        )
+        Chroma loads vectors into memory on the first query against a
+        collection; doing that at startup keeps the cost off the first user
+        request. Failures are logged and otherwise ignored.
+        """
 
-        # Chroma returns lists per query; we only send one query at a time.
-        ids = results.get("ids", [[]])[0]
-        distances = results.get("distances", [[]])[0]
-        metadatas = results.get("metadatas", [[]])[0]
-        documents = results.get("documents", [[]])[0]
+        if not self.is_ready or self._collection is None:
+            return
 
-        return {
-            "question": question,
-            "ids": ids,
-            "distances": distances,
-            "metadatas": metadatas,
-            "documents": documents,
-        }
+        try:
+            self._collection.query(query_texts=["warmup"], n_results=1, include=[])
+        except Exception as exc:
+            logger.warning("Chroma warm-up query failed: %s", exc)
+            return
+
+        logger.info("Pre-warmed Chroma collection '%s'", self._settings.chroma_collection)
+
+    # ------------------------------------------------------------------
+    # Query micro-batching
+    # ------------------------------------------------------------------
+    async def start_query_batcher(self) -> None:
+        """Start the background task that coalesces concurrent queries."""
+
+        if self._batch_worker is not None:
+            return
+
+        self._batch_queue = asyncio.Queue()
+        self._batch_worker = asyncio.create_task(self._run_query_batcher(self._batch_queue))
+
+    async def stop_query_batcher(self) -> None:
+        """Stop the batching task and cancel any queries still waiting in it.
+
+        Batches already dispatched to Chroma are awaited, so callers can
+        safely `close()` the client afterwards.
+        """
+
+        if self._batch_worker is None:
+            return
+
+        self._batch_worker.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._batch_worker
+
+        queue = self._batch_queue
+        while queue is not None and not queue.empty():
+            _, _, future = queue.get_nowait()
+            future.cancel()
+
+        if self._batch_tasks:
+            await asyncio.gather(*self._batch_tasks, return_exceptions=True)
+
+        self._batch_worker = None
+        self._batch_queue = None
+
+    async def submit_query(self, question: str, k: int = 3) -> dict:
+        """Queue a query to be sent to Chroma together with concurrent ones.
+
+        Falls back to a direct (threadpooled) query when the batcher is not
+        running, e.g. outside the FastAPI lifespan.
+        """
+
+        if self._batch_queue is None:
+            return await run_in_threadpool(self.query, question, k)
+
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        await self._batch_queue.put((question, k, future))
+        return await future
+
+    async def _run_query_batcher(self, queue: asyncio.Queue) -> None:
+        loop = asyncio.get_running_loop()
+        max_size = self._settings.query_batch_max_size
+        max_wait = self._settings.query_batch_max_wait_ms / 1000.0
+
+        while True:
+            pending = [await queue.get()]
+            deadline = loop.time() + max_wait
+
+            try:
+                while len(pending) < max_size:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        pending.append(await asyncio.wait_for(queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+            except asyncio.CancelledError:
+                # Shutting down mid-batch: don't leave these callers hanging.
+                for _, _, future in pending:
+                    future.cancel()
+                raise
+
+            # Chroma applies a single `n_results` per call, so bucket by `k`.
+            by_k: dict[int, list] = {}
+            for item in pending:
+                by_k.setdefault(item[1], []).append(item)
+
+            for k, items in by_k.items():
+                # Dispatch without awaiting so the next batch can start
+                # accumulating while this one waits on Chroma.
+                task = asyncio.create_task(self._dispatch_query_batch(k, items))
+                self._batch_tasks.add(task)
+                task.add_done_callback(self._batch_tasks.discard)
+
+    async def _dispatch_query_batch(self, k: int, items: list) -> None:
+        questions = [question for question, _, _ in items]
+        try:
+            results = await run_in_threadpool(self.query_batch, questions, k)
+        except Exception as exc:
+            for _, _, future in items:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        for (_, _, future), result in zip(items, results):
+            if not future.done():
+                future.set_result(result)
@@ -13,6 +13,13 @@ class Settings(BaseSettings):
     chroma_host: str = Field("chromadb", env="CHROMA_HOST")
     chroma_port: int = Field(8000, env="CHROMA_PORT")
     chroma_collection: str = Field("utkrusht_docs", env="CHROMA_COLLECTION")
+    # Passed explicitly to the client so it does not resolve defaults lazily.
+    chroma_tenant: str = Field("default_tenant", env="CHROMA_TENANT")
+    chroma_database: str = Field("default_database", env="CHROMA_DATABASE")
+
+    # Keep-alive connection pool size and retry budget for the Chroma client.
+    chroma_pool_size: int = Field(32, env="CHROMA_POOL_SIZE")
+    chroma_max_retries: int = Field(2, env="CHROMA_MAX_RETRIES")
 
     # If empty or "default", we use Chroma's DefaultEmbeddingFunction.
     # If set to a sentence-transformers model name, we use that model.
@@ -22,6 +29,33 @@ class Settings(BaseSettings):
     # intentionally change embedding behaviour.
     embedding_config_version: str = Field("v1", env="EMBEDDING_CONFIG_VERSION")
 
+    # How long (in seconds) a successful Chroma state refresh is reused by
+    # health checks before another round-trip is made.
+    health_cache_ttl: float = Field(5.0, env="HEALTH_CACHE_TTL")
+
+    # After a failed Chroma heartbeat, further checks fail fast for a backoff
+    # that starts at `chroma_health_backoff_initial` seconds and doubles per
+    # consecutive failure up to `chroma_health_backoff_max`.
+    chroma_health_backoff_initial: float = Field(1.0, env="CHROMA_HEALTH_BACKOFF_INITIAL")
+    chroma_health_backoff_max: float = Field(30.0, env="CHROMA_HEALTH_BACKOFF_MAX")
+
+    # Run a throwaway query at startup so Chroma loads the collection index
+    # before the first user request.
+    prewarm_on_startup: bool = Field(True, env="PREWARM_ON_STARTUP")
+
+    # Concurrent /query requests arriving within `query_batch_max_wait_ms` of
+    # each other are sent to Chroma as a single multi-query call.
+    query_batch_max_size: int = Field(16, env="QUERY_BATCH_MAX_SIZE")
+    query_batch_max_wait_ms: float = Field(5.0, env="QUERY_BATCH_MAX_WAIT_MS")
+
+    # Ingestion batching for the init service. Batch size is capped at 250
+    # documents; batches are also split once their content exceeds
+    # `ingest_batch_max_chars` characters.
+    ingest_batch_size: int = Field(128, env="INGEST_BATCH_SIZE")
+    ingest_batch_max_chars: int = Field(4_000_000, env="INGEST_BATCH_MAX_CHARS")
+    # Number of batches sent to Chroma concurrently during ingestion.
+    ingest_max_in_flight: int = Field(2, env="INGEST_MAX_IN_FLIGHT")
+
     log_level: str = Field("INFO", env="LOG_LEVEL")
 
     class Config:
@@ -3,6 +3,7 @@ from __future__ import annotations
 import hashlib
 import json
 from dataclasses import dataclass
+from functools import cached_property, lru_cache
 from typing import Optional
 
 from chromadb.utils.embedding_functions import (
@@ -25,12 +26,17 @@ class EmbeddingConfig:
     implementation: str = "sentence-transformers"
     version: str = "v1"  # optional, mainly for operators/observability
 
-    @property
+    @cached_property
     def config_id(self) -> str:
         """Stable identifier for this embedding configuration.
 
         We hash a JSON representation so that any field changes lead to a
-        different identifier.
+        different identifier. The instance is frozen, so the result is
+        computed once and cached.
+
+        The hash function and payload format are part of the identifier:
+        collections already store ids produced this way, so switching either
+        would flag every existing collection as drifted.
         """
 
         payload = json.dumps(
@@ -44,6 +50,7 @@ class EmbeddingConfig:
         return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
 
 
+@lru_cache(maxsize=8)
 def normalise_model_name(raw_model_name: Optional[str]) -> str:
     """Normalise the model name from settings into a canonical form.
 
@@ -1,14 +1,22 @@
 from __future__ import annotations
 
 import logging
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
-from typing import Iterable, List
+from typing import Iterable, Iterator, Optional
 
 import chromadb
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on documents per `collection.add` call; larger batches risk
+# exceeding Chroma's server-side batch limit.
+MAX_BATCH_SIZE = 250
+
 
 @dataclass
 class Document:
@@ -19,49 +27,92 @@ class Document:
     metadata: dict
 
 
-def load_documents_from_path(root: str | Path) -> List[Document]:
-    """Load .md and .txt documents from the given directory tree.
+_DOCUMENT_SUFFIXES = {".md", ".txt"}
+
+
+def _iter_document_paths(root_path: Path) -> Iterator[Path]:
+    """Yield paths of .md/.txt files under `root_path`.
+
+    Uses `os.scandir` so file type and name checks come from the directory
+    entry itself; only matching files are wrapped in `Path`. Symlinked files
+    are included (e.g. Kubernetes ConfigMap mounts), but symlinked
+    directories are not descended into, to avoid loops.
+    """
+
+    pending = [str(root_path)]
+    while pending:
+        directory = pending.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                    elif (
+                        entry.is_file()
+                        and os.path.splitext(entry.name)[1].lower() in _DOCUMENT_SUFFIXES
+                    ):
+                        yield Path(entry.path)
+        except OSError as exc:
+            logger.warning("Skipping unreadable directory %s: %s", directory, exc)
+
+
+def _read_document(root_path: Path, path: Path) -> Optional[Document]:
+    """Read a single file into a `Document`, or return `None` to skip it."""
+
+    try:
+        text = path.read_text(encoding="utf-8")
+    except UnicodeDecodeError:
+        logger.warning("Skipping non-text file: %s", path)
+        return None
+    except OSError as exc:
+        logger.warning("Skipping unreadable file %s: %s", path, exc)
+        return None
+
+    if not text.strip():
+        logger.debug("Skipping empty document: %s", path)
+        return None
+
+    return Document(
+        id=str(path.relative_to(root_path)),
+        content=text,
+        metadata={
+            "source_path": str(path),
+            "file_name": path.name,
+        },
+    )
+
+
+def load_documents_from_path(root: str | Path) -> Iterator[Document]:
+    """Lazily load .md and .txt documents from the given directory tree.
 
     Each file becomes one document whose id is the relative path from `root`.
+    Files are read concurrently on a small thread pool (file reads release
+    the GIL), a window at a time, so callers never hold the whole tree in
+    memory.
     """
 
     root_path = Path(root)
-    documents: list[Document] = []
 
     if not root_path.exists():
         logger.warning("Documents root directory does not exist: %s", root_path)
-        return documents
+        return
 
-    for path in root_path.rglob("*"):
-        if not path.is_file():
-            continue
-        if path.suffix.lower() not in {".md", ".txt"}:
-            continue
+    paths = list(_iter_document_paths(root_path))
 
-        try:
-            text = path.read_text(encoding="utf-8")
-        except UnicodeDecodeError:
-            logger.warning("Skipping non-text file: %s", path)
-            continue
-
-        if not text.strip():
-            logger.debug("Skipping empty document: %s", path)
-            continue
-
-        rel_id = str(path.relative_to(root_path))
-        documents.append(
-            Document(
-                id=rel_id,
-                content=text,
-                metadata={
-                    "source_path": str(path),
-                    "file_name": path.name,
-                },
-            )
-        )
-
-    logger.info("Loaded %d documents from %s", len(documents), root_path)
-    return documents
+    max_workers = min(32, (os.cpu_count() or 1) * 4)
+    window = max_workers * 4
+
+    count = 0
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for start in range(0, len(paths), window):
+            chunk = paths[start : start + window]
+            for doc in executor.map(partial(_read_document, root_path), chunk):
+                if doc is None:
+                    continue
+                count += 1
+                yield doc
+
+    logger.info("Loaded %d documents from %s", count, root_path)
 
 
 def _delete_collection_if_exists(client: chromadb.HttpClient, name: str) -> None:
@@ -75,6 +126,20 @@ def _delete_collection_if_exists(client: chromadb.HttpClient, name: str) -> None
             return
 
 
+def _add_batch(collection, collection_name: str, batch: list[Document], start: int) -> None:
+    logger.debug(
+        "Ingesting batch %d-%d into collection '%s'",
+        start,
+        start + len(batch) - 1,
+        collection_name,
+    )
+    collection.add(
+        ids=[d.id for d in batch],
+        documents=[d.content for d in batch],
+        metadatas=[d.metadata for d in batch],
+    )
+
+
 def rebuild_collection(
     client: chromadb.HttpClient,
     collection_name: str,
@@ -82,17 +147,23 @@ def rebuild_collection(
     embedding_config_id: str,
     embedding_model_name: str,
     documents: Iterable[Document],
-    batch_size: int = 32,
+    batch_size: int = 128,
+    max_batch_chars: int = 4_000_000,
+    max_in_flight: int = 2,
 ):
     """Drop and rebuild a Chroma collection with fresh embeddings.
 
     This is used both by the one-time initialization service and by any
     administrative maintenance flows that need to refresh embeddings.
+
+    A batch is flushed once it holds `batch_size` documents (capped at
+    `MAX_BATCH_SIZE`) or adding the next document would push its total
+    content length past `max_batch_chars`. At most `max_in_flight` batches
+    are being added concurrently.
     """
 
-    docs = list(documents)
-    if not docs:
-        logger.warning("No documents to ingest. Collection '%s' will be empty.", collection_name)
+    batch_size = max(1, min(batch_size, MAX_BATCH_SIZE))
+    max_in_flight = max(1, max_in_flight)
 
     _delete_collection_if_exists(client, collection_name)
 
@@ -103,33 +174,94 @@ def rebuild_collection(
         embedding_model_name,
     )
 
+    # Documents are streamed in after the old collection is gone, so a
+    # failure part-way would leave a partial index. The collection is only
+    # stamped with `embedding_config_id` once every batch has been added;
+    # until then readers treat it as drifted and the init service rebuilds it.
     collection = client.create_collection(
         name=collection_name,
+        metadata={"embedding_model_name": embedding_model_name},
+        embedding_function=embedding_function,
+    )
+
+    # Ingest in batches for better memory behaviour: only a bounded number
+    # of batches is held in memory at a time. After the first batch, up to
+    # `max_in_flight` batches are sent concurrently so batch preparation
+    # overlaps server-side work.
+    total = 0
+    in_flight = threading.BoundedSemaphore(max_in_flight)
+    futures: list[Future] = []
+
+    with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+
+        def submit(batch: list[Document]) -> None:
+            nonlocal total
+            if not total:
+                # Send the first batch synchronously so the embedding
+                # function's lazy model load happens once, on one thread.
+                _add_batch(collection, collection_name, batch, start=0)
+                total += len(batch)
+                return
+
+            in_flight.acquire()
+
+            # Stop early if an earlier batch failed instead of reading and
+            # sending the remaining documents first. Each future is checked
+            # exactly once, so one that fails mid-scan is either re-raised
+            # here or kept for the final check below.
+            running: list[Future] = []
+            failed: Optional[Future] = None
+            for future in futures:
+                if not future.done():
+                    running.append(future)
+                elif failed is None and future.exception() is not None:
+                    failed = future
+            if failed is not None:
+                # Give back the slot taken for the batch we won't send.
+                in_flight.release()
+                failed.result()
+            futures[:] = running
+
+            future = executor.submit(_add_batch, collection, collection_name, batch, total)
+            future.add_done_callback(lambda _: in_flight.release())
+            futures.append(future)
+            total += len(batch)
+
+        batch: list[Document] = []
+        batch_chars = 0
+        for doc in documents:
+            if batch and batch_chars + len(doc.content) > max_batch_chars:
+                submit(batch)
+                batch = []
+                batch_chars = 0
+
+            batch.append(doc)
+            batch_chars += len(doc.content)
+            if len(batch) == batch_size:
+                submit(batch)
+                batch = []
+                batch_chars = 0
+
+        if batch:
+            submit(batch)
+
+    # Surface the first ingestion failure, if any.
+    for future in futures:
+        future.result()
+
+    collection.modify(
         metadata={
             "embedding_config_id": embedding_config_id,
             "embedding_model_name": embedding_model_name,
-        },
-        embedding_function=embedding_function,
+        }
     )
 
-    # Ingest in batches for better memory behaviour
-    for start in range(0, len(docs), batch_size):
-        batch = docs[start : start + batch_size]
-        logger.debug(
-            "Ingesting batch %d-%d into collection '%s'",
-            start,
-            start + len(batch) - 1,
-            collection_name,
-        )
-        collection.add(
-            ids=[d.id for d in batch],
-            documents=[d.content for d in batch],
-            metadatas=[d.metadata for d in batch],
-        )
+    if not total:
+        logger.warning("No documents to ingest. Collection '%s' will be empty.", collection_name)
 
     logger.info(
         "Finished ingesting %d documents into collection '%s'",
-        len(docs),
+        total,
         collection_name,
     )
     return collection
@@ -9,7 +9,8 @@ def configure_logging(level: str = "INFO", service_name: str = "app") -> None:
 
     This sets up a simple console logger with timestamps, log level, and
     service name. It is intentionally minimal but suitable for container
-    deployments.
+    deployments. Timestamps are raw epoch seconds (`%(created)`), which
+    avoids per-record `strftime` work; log shippers can format them.
     """
 
     dictConfig(
@@ -19,10 +20,11 @@ def configure_logging(level: str = "INFO", service_name: str = "app") -> None:
             "formatters": {
                 "default": {
                     "format": (
-                        "%(asctime)s | %(levelname)s | %(name)s | "
+                        "%(created).3f | %(levelname)s | %(name)s | "
                         + service_name
                         + " | %(message)s"
                     ),
+                    "style": "%",
                 },
             },
             "handlers": {
@@ -47,6 +47,8 @@ def main() -> int:
         client = chromadb.HttpClient(
             host=settings.chroma_host,
             port=settings.chroma_port,
+            tenant=settings.chroma_tenant,
+            database=settings.chroma_database,
         )
     except Exception as exc:  # pragma: no cover - defensive
         logger.exception("Failed to create Chroma HTTP client: %s", exc)
@@ -97,12 +99,6 @@ def main() -> int:
         docs_root = Path("/app/data/docs")
         documents = load_documents_from_path(docs_root)
 
-        if not documents:
-            logger.warning(
-                "No documents found under %s. Initialization will complete, but queries will return no results.",
-                docs_root,
-            )
-
         rebuild_collection(
             client=client,
             collection_name=settings.chroma_collection,
@@ -110,6 +106,9 @@ def main() -> int:
             embedding_config_id=embedding_config.config_id,
             embedding_model_name=embedding_model,
             documents=documents,
+            batch_size=settings.ingest_batch_size,
+            max_batch_chars=settings.ingest_batch_max_chars,
+            max_in_flight=settings.ingest_max_in_flight,
         )
 
         logger.info("Initialization complete")
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+
+import pytest
+
+from common.ingest import Document, load_documents_from_path, rebuild_collection
+
+
+class FakeCollection:
+    """Stand-in for a Chroma collection that records each `add` call."""
+
+    def __init__(self, fail_on_batch: int | None = None, delay: float = 0.0) -> None:
+        self.fail_on_batch = fail_on_batch
+        self.delay = delay
+        self.metadata: dict = {}
+        self.added: list[str] = []
+        self.events: list[tuple[str, int]] = []
+        self.active = 0
+        self.max_active = 0
+        self._calls = 0
+        self._lock = threading.Lock()
+
+    def add(self, ids, documents, metadatas):
+        with self._lock:
+            batch_no = self._calls
+            self._calls += 1
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            self.events.append(("start", batch_no))
+
+        time.sleep(self.delay)
+
+        with self._lock:
+            self.active -= 1
+            self.events.append(("end", batch_no))
+            if batch_no == self.fail_on_batch:
+                raise RuntimeError(f"batch {batch_no} failed")
+            self.added.extend(ids)
+
+    def modify(self, metadata):
+        self.metadata = metadata
+
+
+class FakeClient:
+    def __init__(self, collection: FakeCollection) -> None:
+        self.collection = collection
+
+    def list_collections(self):
+        return []
+
+    def create_collection(self, name, metadata, embedding_function):
+        self.collection.metadata = metadata
+        return self.collection
+
+
+def _documents(count: int, read: list[int] | None = None):
+    for i in range(count):
+        if read is not None:
+            read[0] += 1
+        yield Document(id=f"d{i}", content="text", metadata={})
+
+
+def _rebuild(collection: FakeCollection, documents, **kwargs):
+    return rebuild_collection(
+        client=FakeClient(collection),
+        collection_name="docs",
+        embedding_function=None,
+        embedding_config_id="cfg",
+        embedding_model_name="default",
+        documents=documents,
+        **kwargs,
+    )
+
+
+def test_batches_in_flight_are_capped():
+    collection = FakeCollection(delay=0.02)
+
+    _rebuild(collection, _documents(40), batch_size=2, max_in_flight=3)
+
+    assert sorted(collection.added, key=lambda d: int(d[1:])) == [f"d{i}" for i in range(40)]
+    assert 1 < collection.max_active <= 3
+
+
+def test_first_batch_is_sent_alone():
+    collection = FakeCollection(delay=0.02)
+
+    _rebuild(collection, _documents(10), batch_size=2, max_in_flight=4)
+
+    assert collection.events[:2] == [("start", 0), ("end", 0)]
+
+
+def test_failed_batch_stops_ingestion_and_raises():
+    collection = FakeCollection(fail_on_batch=1, delay=0.02)
+    read = [0]
+
+    with pytest.raises(RuntimeError, match="batch 1 failed"):
+        _rebuild(collection, _documents(1000, read), batch_size=2, max_in_flight=2)
+
+    assert read[0] < 1000
+
+
+def test_failure_in_last_batches_is_not_lost():
+    collection = FakeCollection(fail_on_batch=2)
+
+    with pytest.raises(RuntimeError, match="batch 2 failed"):
+        _rebuild(collection, _documents(6), batch_size=2, max_in_flight=2)
+
+
+@pytest.mark.parametrize("delay", [0.01, 0.015, 0.02])
+def test_batch_failing_during_the_failure_scan_is_not_lost(monkeypatch, delay):
+    # Widen the window between a future being inspected and pruned by making
+    # `done()` slow on the submitting thread.
+    original_done = Future.done
+    main_thread = threading.current_thread()
+
+    def slow_done(self):
+        if threading.current_thread() is main_thread:
+            time.sleep(0.01)
+        return original_done(self)
+
+    monkeypatch.setattr(Future, "done", slow_done)
+    collection = FakeCollection(fail_on_batch=1, delay=delay)
+
+    with pytest.raises(RuntimeError, match="batch 1 failed"):
+        _rebuild(collection, _documents(6), batch_size=1, max_in_flight=2)
+
+
+def test_config_id_is_stamped_only_after_all_batches_succeed():
+    collection = FakeCollection()
+    _rebuild(collection, _documents(5), batch_size=2)
+    assert collection.metadata["embedding_config_id"] == "cfg"
+
+    failed = FakeCollection(fail_on_batch=1)
+    with pytest.raises(RuntimeError):
+        _rebuild(failed, _documents(5), batch_size=2)
+    assert "embedding_config_id" not in failed.metadata
+
+
+def test_unreadable_files_are_skipped(tmp_path, monkeypatch):
+    (tmp_path / "ok.md").write_text("hello", encoding="utf-8")
+    (tmp_path / "locked.md").write_text("secret", encoding="utf-8")
+    original_read_text = Path.read_text
+
+    def read_text(self, *args, **kwargs):
+        if self.name == "locked.md":
+            raise PermissionError(13, "Permission denied", str(self))
+        return original_read_text(self, *args, **kwargs)
+
+    monkeypatch.setattr(Path, "read_text", read_text)
+
+    assert [doc.id for doc in load_documents_from_path(tmp_path)] == ["ok.md"]
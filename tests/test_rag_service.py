@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import pytest
+
+import app.rag_service as rag_service
+from app.rag_service import RAGService
+from common.config import Settings
+from common.exceptions import ChromaConnectionError
+
+
+class FakeCollection:
+    """Stand-in for a Chroma collection that records each `query` call."""
+
+    def __init__(self, error: Exception | None = None, delay: float = 0.0) -> None:
+        self.calls: list[tuple[list[str], int]] = []
+        self.error = error
+        self.delay = delay
+        self.finished = threading.Event()
+
+    def query(self, query_texts, n_results, include):
+        self.calls.append((list(query_texts), n_results))
+        if self.delay:
+            threading.Event().wait(self.delay)
+        self.finished.set()
+        if self.error is not None:
+            raise self.error
+        return {
+            "ids": [[f"{q}-{i}" for i in range(n_results)] for q in query_texts],
+            "distances": [[0.0] * n_results for _ in query_texts],
+            "metadatas": [[{"q": q}] * n_results for q in query_texts],
+            "documents": [[q] * n_results for q in query_texts],
+        }
+
+
+@pytest.fixture
+def make_service(monkeypatch):
+    monkeypatch.setattr(rag_service.chromadb, "HttpClient", lambda **kwargs: object())
+    monkeypatch.setattr(rag_service, "build_embedding_function", lambda name: None)
+
+    def _make(collection: FakeCollection, **overrides) -> RAGService:
+        settings = Settings(
+            query_batch_max_size=overrides.pop("query_batch_max_size", 16),
+            query_batch_max_wait_ms=overrides.pop("query_batch_max_wait_ms", 50.0),
+            **overrides,
+        )
+        service = RAGService(settings)
+        service._collection = collection
+        service._chroma_connected = True
+        return service
+
+    return _make
+
+
+def test_batched_results_are_returned_to_the_matching_caller(make_service):
+    collection = FakeCollection()
+    service = make_service(collection)
+    questions = [f"q{i}" for i in range(8)]
+
+    async def run():
+        await service.start_query_batcher()
+        try:
+            return await asyncio.gather(*(service.submit_query(q, k=2) for q in questions))
+        finally:
+            await service.stop_query_batcher()
+
+    results = asyncio.run(run())
+
+    assert collection.calls == [(questions, 2)]
+    for question, result in zip(questions, results):
+        assert result["ids"] == [f"{question}-0", f"{question}-1"]
+        assert result["documents"] == [question, question]
+
+
+def test_batches_are_bucketed_by_k(make_service):
+    collection = FakeCollection()
+    service = make_service(collection)
+    requests = [("a", 1), ("b", 2), ("c", 1), ("d", 3), ("e", 2)]
+
+    async def run():
+        await service.start_query_batcher()
+        try:
+            return await asyncio.gather(*(service.submit_query(q, k=k) for q, k in requests))
+        finally:
+            await service.stop_query_batcher()
+
+    results = asyncio.run(run())
+
+    assert sorted(collection.calls, key=lambda call: call[1]) == [
+        (["a", "c"], 1),
+        (["b", "e"], 2),
+        (["d"], 3),
+    ]
+    for (question, k), result in zip(requests, results):
+        assert result["ids"] == [f"{question}-{i}" for i in range(k)]
+
+
+def test_batch_size_is_capped(make_service):
+    collection = FakeCollection()
+    service = make_service(collection, query_batch_max_size=3)
+
+    async def run():
+        await service.start_query_batcher()
+        try:
+            await asyncio.gather(*(service.submit_query(f"q{i}", k=1) for i in range(7)))
+        finally:
+            await service.stop_query_batcher()
+
+    asyncio.run(run())
+
+    assert [len(questions) for questions, _ in collection.calls] == [3, 3, 1]
+
+
+def test_query_failure_is_fanned_out_to_every_caller(make_service):
+    collection = FakeCollection(error=RuntimeError("collection gone"))
+    service = make_service(collection)
+
+    async def run():
+        await service.start_query_batcher()
+        try:
+            return await asyncio.gather(
+                *(service.submit_query(q, k=1) for q in ("a", "b", "c")),
+                return_exceptions=True,
+            )
+        finally:
+            await service.stop_query_batcher()
+
+    results = asyncio.run(run())
+
+    assert len(collection.calls) == 1
+    assert all(isinstance(result, ChromaConnectionError) for result in results)
+
+
+def test_stop_waits_for_dispatched_batches(make_service):
+    collection = FakeCollection(delay=0.2)
+    service = make_service(collection, query_batch_max_wait_ms=0.0)
+
+    async def run():
+        await service.start_query_batcher()
+        pending = asyncio.ensure_future(service.submit_query("slow", k=1))
+        while not service._batch_tasks:
+            await asyncio.sleep(0)
+        await service.stop_query_batcher()
+        assert collection.finished.is_set()
+        return await pending
+
+    result = asyncio.run(run())
+
+    assert result["ids"] == ["slow-0"]
+
+
+class FailingHeartbeatClient:
+    """Client whose heartbeat fails once `parties` probes are all in flight."""
+
+    def __init__(self, parties: int = 1) -> None:
+        self.barrier = threading.Barrier(parties)
+        self.calls = 0
+
+    def heartbeat(self):
+        self.calls += 1
+        self.barrier.wait(timeout=5)
+        raise RuntimeError("chroma down")
+
+
+def test_concurrent_health_failures_grow_backoff_once(make_service):
+    service = make_service(
+        FakeCollection(),
+        chroma_health_backoff_initial=1.0,
+        chroma_health_backoff_max=30.0,
+    )
+    service._client = FailingHeartbeatClient(parties=4)
+
+    threads = [threading.Thread(target=service.check_chroma_health) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert service._client.calls == 4
+    assert service._health_backoff == 1.0
+    # The breaker is open: no further network calls until it expires.
+    assert service.check_chroma_health() is False
+    assert service._client.calls == 4
+
+
+def test_health_backoff_doubles_per_outage_and_resets_on_success(make_service):
+    service = make_service(
+        FakeCollection(),
+        chroma_health_backoff_initial=1.0,
+        chroma_health_backoff_max=3.0,
+    )
+    service._client = FailingHeartbeatClient()
+
+    backoffs = []
+    for _ in range(3):
+        service._breaker_until = 0.0  # let the breaker expire
+        service.check_chroma_health()
+        backoffs.append(service._health_backoff)
+    assert backoffs == [1.0, 2.0, 3.0]
+
+    service._client.heartbeat = lambda: None
+    service._breaker_until = 0.0
+    assert service.check_chroma_health() is True
+    assert service._health_backoff == 0.0